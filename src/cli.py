@@ -2,13 +2,57 @@
 
 import argparse
 import logging
+import os
 
 from src.fixed_width_file import FixedWidthFile
 
-logger = logging.getLogger("cli")
-logging.basicConfig(
-    level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s"
-)
+logger = logging.getLogger(__name__)
+
+# Transaction cache: parsed files keyed by (filename, mtime_ns, size). It lives
+# as long as the module, so programmatic callers making several calls on the
+# same file share one parse.
+_TCACHE = {}
+
+
+def _cache_key(filename):
+    """Build the transaction cache key for a file from its current stat."""
+    st = os.stat(filename)
+    return (filename, st.st_mtime_ns, st.st_size)
+
+
+def _open(filename):
+    """
+    Return a FixedWidthFile for the file, reusing the cached instance while the
+    file is unchanged on disk.
+
+    A file seen for the first time is not parsed, so a one-off lookup is a
+    plain scan of the mapped file; its records are read once it is reused.
+
+    Args:
+        filename (str): Path to the fixed-width file.
+
+    Returns:
+        FixedWidthFile: The file.
+    """
+    fixed_width_file = _TCACHE.get(_cache_key(filename))
+    if fixed_width_file is None:
+        fixed_width_file = FixedWidthFile(filename)
+        _store(fixed_width_file)
+    elif fixed_width_file.records is None:
+        fixed_width_file.read()
+    return fixed_width_file
+
+
+def _store(fixed_width_file):
+    """Cache a FixedWidthFile under the current stat of its file."""
+    _invalidate(fixed_width_file.filename)
+    _TCACHE[_cache_key(fixed_width_file.filename)] = fixed_width_file
+
+
+def _invalidate(filename):
+    """Drop every cached entry for the given file."""
+    for key in [key for key in _TCACHE if key[0] == filename]:
+        del _TCACHE[key]
 
 
 def add_transaction(filename, amount, currency):
@@ -17,19 +61,28 @@ def add_transaction(filename, amount, currency):
 
     Args:
         filename (str): Path to the fixed-width file.
-        amount (float): Amount of the transaction.
+        amount (str): Amount of the transaction (format: 1234.56).
         currency (str): Currency code for the transaction.
+
+    Returns:
+        bool: True if the transaction was added, False otherwise.
     """
+    _invalidate(filename)
     fixed_width_file = FixedWidthFile(filename)
-    if fixed_width_file.add_transaction(amount, currency):
-        return "Successfully added a new transaction."
-    return "Failed to add transaction."
+    try:
+        return fixed_width_file.add_transaction(amount, currency)
+    except ValueError as e:
+        logger.error("Error: %s", e)
+    return False
 
 
 def get_value(filename, record_type, field_name, transaction_counter=None):
     """
     Retrieve the value of a field from a fixed-width file for a specific record type.
 
+    Numeric fields are held as int, and are zero-filled back to the width of
+    their field, as they are stored in the file.
+
     Args:
         filename (str): Path to the fixed-width file.
         record_type (str): The type of record (e.g., HEADER, TRANSACTION, FOOTER).
@@ -40,27 +93,23 @@ def get_value(filename, record_type, field_name, transaction_counter=None):
         str or None: The value of the field if found, or None if not found.
     """
     try:
-        fixed_width_file = FixedWidthFile(filename)
-        records = fixed_width_file.read()
-        if records:
-            filtered_records = [
-                record
-                for record in records
-                if record["type"] == record_type.upper()
-                and (
-                    not transaction_counter
-                    or record.get("counter") == transaction_counter
-                )
+        fixed_width_file = _open(filename)
+        value = fixed_width_file.get_value(
+            record_type.upper(), field_name, transaction_counter
+        )
+        if isinstance(value, int):
+            start, end = fixed_width_file.parser.FIELD_DEFINITIONS[record_type.upper()][
+                field_name
             ]
-            for record in filtered_records:
-                if field_name in record:
-                    return str(record[field_name])
-            logger.info(
-                "No '%s' records or transactions with counter '%s' in '%s'.",
-                record_type,
-                transaction_counter,
-                filename,
-            )
+            return f"{value:0{end - start}d}"
+        if value is not None:
+            return str(value)
+        logger.info(
+            "No '%s' records or transactions with counter '%s' in '%s'.",
+            record_type,
+            transaction_counter,
+            filename,
+        )
     except FileNotFoundError:
         logger.error("File not found: %s", filename)
     except IOError as e:
@@ -73,22 +122,77 @@ def get_value(filename, record_type, field_name, transaction_counter=None):
 def set_value(filename, record_type, field_name, value, transaction_counter=None):
     """
     Sets a new value for a field in a specified fixed-width file.
+
+    The record is located through the cached counter index, and since the
+    update keeps the loaded records in sync, the instance is cached again
+    under the file's new stat.
+
+    Returns:
+        bool: True if the field was updated, False otherwise.
     """
-    fixed_width_file = FixedWidthFile(filename)
-    if fixed_width_file.set_value(record_type, field_name, value, transaction_counter):
-        return f"Successfully set '{field_name}' to '{value}'."
+    try:
+        fixed_width_file = _open(filename)
+        _invalidate(filename)
+        if fixed_width_file.set_value(
+            record_type, field_name, value, transaction_counter
+        ):
+            _store(fixed_width_file)
+            return True
+    except ValueError as e:
+        logger.error("Error: %s", e)
+    return False
+
 
-    return "Failed to set value."
+def _get_command(args):
+    """Run the get command and return whether it succeeded and its output."""
+    value = get_value(
+        args.filename,
+        args.record_type,
+        args.field_name,
+        args.transaction_counter,
+    )
+    if value is None:
+        return False, "Failed to retrieve value."
+    return True, f"Value of '{args.field_name}': {value}"
 
 
-def main():
+def _set_command(args):
+    """Run the set command and return whether it succeeded and its output."""
+    if set_value(
+        args.filename,
+        args.record_type,
+        args.field_name,
+        args.value,
+        args.transaction_counter,
+    ):
+        return True, f"Successfully set '{args.field_name}' to '{args.value}'."
+    return False, "Failed to set value."
+
+
+def _add_command(args):
+    """Run the add command and return whether it succeeded and its output."""
+    if add_transaction(args.filename, args.amount, args.currency):
+        return True, "Successfully added a new transaction."
+    return False, "Failed to add transaction."
+
+
+def _help_command(args):  # pylint: disable=unused-argument
+    """Print the usage when no command is given."""
+    _PARSER.print_help()
+    return True, None
+
+
+def _build_parser():
     """
-    The main entry point of the CLI application.
+    Build the argument parser of the CLI application.
+
+    Returns:
+        argparse.ArgumentParser: The parser with the get, set and add commands.
     """
     parser = argparse.ArgumentParser(
         description="Manage and manipulate fixed-width files."
     )
-    parser.set_defaults(func=lambda x: parser.print_help())
+    parser.set_defaults(func=_help_command)
     subparsers = parser.add_subparsers(dest="command", help="Commands available")
 
     # get command
@@ -108,7 +212,7 @@ def main():
         help="Transaction counter for filtering",
         required=False,
     )
-    get_parser.set_defaults(func=get_value)
+    get_parser.set_defaults(func=_get_command)
 
     # set command
     set_parser = subparsers.add_parser(
@@ -128,7 +232,7 @@ def main():
         help="Transaction counter for filtering",
         required=False,
     )
-    set_parser.set_defaults(func=set_value)
+    set_parser.set_defaults(func=_set_command)
 
     # add command
     add_parser = subparsers.add_parser(
@@ -137,38 +241,31 @@ def main():
     )
     add_parser.add_argument("filename", help="Path to the fixed-width file")
     add_parser.add_argument(
-        "amount", type=float, help="Amount of the transaction (format: 1234.56)"
+        "amount", help="Amount of the transaction (format: 1234.56)"
     )
     add_parser.add_argument(
         "currency", help="Currency code for the transaction (e.g., USD, EUR, GBP)"
     )
-    add_parser.set_defaults(func=add_transaction)
+    add_parser.set_defaults(func=_add_command)
+    return parser
 
-    args = parser.parse_args()
 
-    if args.command == "get":
-        value = get_value(
-            args.filename, args.record_type, args.field_name, args.transaction_counter
-        )
-        if value is not None:
-            print(f"Value of '{args.field_name}': {value}")
-        else:
-            print("Failed to retrieve value.")
-    elif args.command == "set":
-        if set_value(
-            args.filename,
-            args.record_type,
-            args.field_name,
-            args.value,
-            args.transaction_counter,
-        ):
-            print(f"Successfully set '{args.field_name}' to '{args.value}'.")
-        else:
-            print("Failed to set value.")
-    elif args.command == "add":
-        if add_transaction(args.filename, args.amount, args.currency):
-            print("Successfully added a new transaction.")
-        else:
-            print("Failed to add transaction.")
-    else:
-        parser.print_help()
+# Built once at import so repeated calls to main() skip the parser setup.
+_PARSER = _build_parser()
+
+
+def main():
+    """
+    The main entry point of the CLI application.
+
+    Returns:
+        int: The exit status, 0 if the command succeeded and 1 otherwise.
+    """
+    logging.basicConfig(
+        level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s"
+    )
+    args = _PARSER.parse_args()
+    succeeded, output = args.func(args)
+    if output is not None:
+        print(output)
+    return 0 if succeeded else 1
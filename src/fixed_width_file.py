@@ -3,16 +3,120 @@ Core module for handling fixed-width files.
 Provides the FixedWidthFile class for handling fixed-width file operations.
 """
 
-import decimal
+import bisect
+import itertools
 import logging
+import os
+from collections.abc import Sequence
+from concurrent.futures import ProcessPoolExecutor
 
 from src.fixed_width_file_handler import FixedWidthFileManager
 from src.record_parser import RecordParser
 
-logger = logging.getLogger("FixedWidthFile")
-logging.basicConfig(
-    level=logging.DEBUG, format="%(asctime)s - %(levelname)s - %(message)s"
-)
+logger = logging.getLogger(__name__)
+
+# Files with fewer records are read serially, as spawning workers costs more.
+PARALLEL_READ_THRESHOLD = 10_000
+
+
+def _to_cents(amount):
+    """Convert a decimal amount such as "1234.56" to integer cents.
+
+    The conversion is done on the digits of the string, so no floating-point
+    or Decimal arithmetic is involved. Digits past the cents are truncated.
+    Amount fields hold digits only, so signed amounts are rejected.
+
+    Args:
+        amount (str): The amount to convert.
+
+    Returns:
+        int: The amount in cents.
+
+    Raises:
+        ValueError: If the amount is not a plain unsigned decimal number.
+    """
+    text = str(amount).strip()
+    units, _, cents = text.partition(".")
+    if not (units or cents) or not f"{units}{cents}".isdecimal():
+        raise ValueError(f"Invalid amount: {amount}")
+    return int(units or "0") * 100 + int((cents + "00")[:2])
+
+
+def _to_field_value(field_name, value):
+    """Convert a new field value to the type the field is held as.
+
+    Fields sit at fixed byte offsets, so text values must be printable ASCII.
+
+    Raises:
+        ValueError: If a numeric value is not an unsigned number, or a text
+            value is not printable ASCII.
+    """
+    if field_name == "amount":
+        return _to_cents(value)
+    if field_name in RecordParser.NUMERIC_FIELDS:
+        if not str(value).isdigit():
+            raise ValueError(f"Invalid number: {value}")
+        return int(value)
+    if not (value.isascii() and value.isprintable()):
+        raise ValueError(f"Values must be printable ASCII text: {value!r}")
+    return value
+
+
+def _to_counter(transaction_counter):
+    """Convert a transaction counter such as "000004" to int, or None if invalid."""
+    try:
+        return int(transaction_counter)
+    except (TypeError, ValueError):
+        return None
+
+
+class RecordColumns(Sequence):
+    """The records of a file, stored column-wise per record type.
+
+    Indexing or iterating builds the record dicts on demand, in file order,
+    while aggregations can work on the columns directly. It compares equal to
+    any sequence of the same record dicts, such as a list. Transactions are
+    indexed by counter, and the first transaction with a given counter wins,
+    as in a scan of the file.
+
+    Args:
+        columns (dict): The columns of each record type, by field name.
+        positions (dict): The file index of each record, per record type.
+    """
+
+    def __init__(self, columns, positions):
+        self.columns = columns
+        self.positions = positions
+        self._rows = [
+            (record_type, column_index)
+            for _, record_type, column_index in sorted(
+                (index, record_type, column_index)
+                for record_type, indexes in positions.items()
+                for column_index, index in enumerate(indexes)
+            )
+        ]
+        self.counter_index = {}
+        for column_index, counter in enumerate(columns["TRANSACTION"]["counter"]):
+            self.counter_index.setdefault(counter, column_index)
+
+    def __len__(self):
+        return len(self._rows)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self)))]
+        record_type, column_index = self._rows[index]
+        record = {"type": record_type}
+        for field_name, column in self.columns[record_type].items():
+            record[field_name] = column[column_index]
+        return record
+
+    def __eq__(self, other):
+        if not isinstance(other, Sequence) or isinstance(other, (str, bytes)):
+            return NotImplemented
+        return len(self) == len(other) and all(
+            record == other_record for record, other_record in zip(self, other)
+        )
 
 
 class FixedWidthFile:
@@ -27,50 +131,302 @@ class FixedWidthFile:
         self.filename = filename
         self.file_manager = FixedWidthFileManager(filename)
         self.parser = RecordParser()
-        self.transaction_counter = self.initialize_transaction_counter()
-        self.record_types = {
-            "HEADER": {
-                "fields": ["field_id", "file_type", "creation_date", "reserved"],
-            },
-            "TRANSACTION": {
-                "fields": ["field_id", "counter", "amount", "currency", "reserved"],
-            },
-            "FOOTER": {
-                "fields": ["field_id", "total_count", "control_sum", "reserved"],
-            },
+        self._max_counter = None
+        self._lines = None
+        self._footer = None
+        self.records = None
+
+    @property
+    def transaction_counter(self):
+        """int: The counter of the last transaction, read on first use."""
+        if self._max_counter is None:
+            self._max_counter = self.initialize_transaction_counter()
+        return self._max_counter
+
+    @transaction_counter.setter
+    def transaction_counter(self, value):
+        self._max_counter = value
+
+    def read(self, workers=None):
+        """Read the file and process the content.
+
+        The records are unpacked column-wise and kept as `self.records`.
+        Records are fixed-width, so a large file is split by record index
+        into one range per worker and the ranges are unpacked in parallel.
+
+        Args:
+            workers (int, optional): The number of worker processes. The file
+                is read serially if not given or if it has fewer than
+                `PARALLEL_READ_THRESHOLD` records.
+
+        Returns:
+            RecordColumns: The processed records from the file. This is a
+                sequence of record dicts rather than a list; use `list()` on
+                it where a real list is needed.
+
+        Raises:
+            ValueError: If a record is invalid or has an unknown type.
+        """
+        stride = self.parser.RECORD_LENGTH + 1
+        count = -(-os.path.getsize(self.filename) // stride)
+        if workers and workers > 1 and count >= PARALLEL_READ_THRESHOLD:
+            columns, positions = self._read_parallel(workers, count)
+        else:
+            columns, positions = self._unpack_records(self._read_buffer())
+        self.records = RecordColumns(columns, positions)
+        self._max_counter = max(columns["TRANSACTION"]["counter"], default=0)
+        return self.records
+
+    def _read_parallel(self, workers, count):
+        """Unpack the records of the file in worker processes.
+
+        Args:
+            workers (int): The number of worker processes.
+            count (int): The number of records in the file.
+
+        Returns:
+            tuple: The merged columns and record positions, as returned by
+                `_unpack_records`.
+        """
+        starts = range(0, count, -(-count // workers))
+        stops = itertools.chain(starts[1:], [count])
+        with ProcessPoolExecutor(workers) as pool:
+            parts = list(
+                pool.map(
+                    self._read_range, itertools.repeat(self.filename), starts, stops
+                )
+            )
+        columns, positions = parts[0]
+        for part_columns, part_positions in parts[1:]:
+            for record_type, fields in part_columns.items():
+                for field_name, values in fields.items():
+                    columns[record_type][field_name] += values
+                positions[record_type] += part_positions[record_type]
+        return columns, positions
+
+    @classmethod
+    def _read_range(cls, filename, start, stop):
+        """Unpack the records in [start, stop) of a file into columns.
+
+        Runs in a worker process of `read`.
+        """
+        fixed_width_file = cls(filename)
+        return fixed_width_file._unpack_records(
+            fixed_width_file._read_buffer(start, stop), start
+        )
+
+    def validate(self):
+        """Check every record of the file against its layout without parsing.
+
+        The mapped file is matched against the compiled record layouts in a
+        single regex pass, and only an invalid file is walked record by
+        record to report the first offending line.
+
+        Raises:
+            ValueError: If a record does not match the layout of its type.
+        """
+        with self.file_manager.mapped() as mm:
+            self._validate_mapping(mm)
+
+    def _validate_mapping(self, mm):
+        """Check an already mapped file against the record layouts.
+
+        Args:
+            mm (mmap.mmap or bytes): The mapped file.
+
+        Raises:
+            ValueError: If a record does not match the layout of its type.
+        """
+        if self.parser.FILE_PATTERN.fullmatch(mm):
+            return
+        record_length = self.parser.RECORD_LENGTH
+        for index, offset in enumerate(range(0, len(mm), record_length + 1)):
+            end = offset + record_length
+            matched = self.parser.RECORD_PATTERN.fullmatch(mm, offset, end)
+            if not matched or mm[end : end + 1] not in (b"\n", b""):
+                logger.error("Invalid record on line %d.", index + 1)
+                raise ValueError(f"Invalid record on line {index + 1}.")
+
+    def read_columns(self, record_type="TRANSACTION"):
+        """Read every record of one type into columns with a bulk unpack.
+
+        The whole file is unpacked by `struct.iter_unpack` in C, one row per
+        fixed-length record, and only rows of the requested type are kept.
+
+        Args:
+            record_type (str): The record type to read.
+
+        Returns:
+            dict: A list of values per field of the record type.
+
+        Raises:
+            ValueError: If the file is not made of whole records or holds an
+                invalid currency code.
+        """
+        return self._unpack_columns(self._read_buffer(), record_type)
+
+    def _unpack_records(self, buf, first=0):
+        """Unpack a buffer of whole records into columns per record type.
+
+        Args:
+            buf (bytes): Whole records, as returned by `_read_buffer`.
+            first (int, optional): The file index of the first record in `buf`.
+
+        Returns:
+            tuple: The columns of every record type, and the file index of
+                each record per record type.
+
+        Raises:
+            ValueError: If a record has an unknown type or an invalid field.
+        """
+        columns = {
+            record_type: self._unpack_columns(buf, record_type)
+            for record_type in self.parser.FIELD_DEFINITIONS
         }
+        positions = {record_type: [] for record_type in columns}
+        for index, (field_id,) in enumerate(
+            self.parser.RECORD_ID_STRUCT.iter_unpack(buf), first
+        ):
+            positions[self.parser.get_record_type(field_id)].append(index)
+        return columns, positions
 
-    def read(self):
-        """Read the file and process the content.
+    def get_value(self, record_type, field_name, transaction_counter=None):
+        """Get the value of a field from the loaded columns.
+
+        If the columns are not loaded, the file is scanned with `scan_value`
+        instead of being parsed.
+
+        Args:
+            record_type (str): The record type to read from.
+            field_name (str): The field to read.
+            transaction_counter (str, optional): The counter of the transaction.
 
         Returns:
-            list: The processed records from the file.
+            str or int or None: The value of the field, or None if there is no
+                match.
         """
-        lines = self.file_manager.read_lines()
-        records = self.process_content(lines)
-        return records
+        if self.records is None:
+            return self.scan_value(record_type, field_name, transaction_counter)
+        column = self.records.columns.get(record_type, {}).get(field_name)
+        if not column:
+            return None
+        if not transaction_counter:
+            return column[0]
+        if record_type != "TRANSACTION":
+            return None
+        index = self.records.counter_index.get(_to_counter(transaction_counter))
+        return None if index is None else column[index]
+
+    def scan_value(self, record_type, field_name, transaction_counter=None):
+        """Get the value of a field by scanning the memory-mapped file.
+
+        The file is first checked against the record layouts in one regex
+        pass, so a malformed file is rejected here just as when its columns
+        are loaded. Then only the record ID and counter of each record are
+        compared, and only the requested field of the matching record is
+        decoded.
 
-    def process_content(self, content):
-        """Process the content of the file.
+        Args:
+            record_type (str): The record type to read from.
+            field_name (str): The field to read.
+            transaction_counter (str, optional): The counter of the transaction.
+
+        Returns:
+            str or int or None: The value of the field, or None if there is no
+                match.
+
+        Raises:
+            ValueError: If a record does not match the layout of its type.
+        """
+        fields = self.parser.FIELD_DEFINITIONS.get(record_type, {})
+        if field_name not in fields:
+            return None
+        counter = None
+        if transaction_counter:
+            counter = _to_counter(transaction_counter)
+            if record_type != "TRANSACTION" or counter is None:
+                return None
+        field_id = self.parser.FIELD_IDS[record_type]
+        transaction_fields = self.parser.FIELD_DEFINITIONS["TRANSACTION"]
+        counter_start, counter_end = transaction_fields["counter"]
+        start, end = fields[field_name]
+        with self.file_manager.mapped() as mm:
+            self._validate_mapping(mm)
+            for offset in range(0, len(mm), self.parser.RECORD_LENGTH + 1):
+                if mm[offset : offset + 2] != field_id:
+                    continue
+                if (
+                    counter is not None
+                    and int(mm[offset + counter_start : offset + counter_end])
+                    != counter
+                ):
+                    continue
+                return self.parser.decode_field(
+                    field_name, mm[offset + start : offset + end]
+                )
+        return None
+
+    def _read_buffer(self, start=0, stop=None):
+        """Read the file as bytes made of whole newline-terminated records.
 
         Args:
-            content (list): The content of the file as a list of lines.
+            start (int, optional): The index of the first record to read.
+            stop (int, optional): The index past the last record to read.
+
+        Returns:
+            bytes: The file content, with the final newline restored if missing.
 
         Raises:
-            ValueError: If the line length is invalid.
-        """
-        processed_records = []
-        for line in content:
-            clean_line = line.strip()
-            if len(clean_line) != self.parser.RECORD_LENGTH:
-                logger.error("Invalid line length: %d", len(clean_line))
-                raise ValueError("Invalid line length.")
-            record_type = self.parser.get_record_type(clean_line)
-            data = self.parser.parse_line(clean_line, record_type)
-            self.validate_data(data, record_type)
-            processed_records.append(data)
-            self.transaction_counter += 1 if record_type == "TRANSACTION" else 0
-        return processed_records
+            ValueError: If the file is not ASCII or not made of whole records.
+        """
+        stride = self.parser.RECORD_LENGTH + 1
+        if start or stop is not None:
+            end = None if stop is None else stop * stride
+            with self.file_manager.mapped() as mm:
+                buf = mm[start * stride : end]
+        else:
+            buf = self.file_manager.read_bytes()
+        if len(buf) % stride == stride - 1:
+            buf += b"\n"
+        if len(buf) % stride or not set(buf[stride - 1 :: stride]) <= {10}:
+            if not buf.isascii():
+                # Multi-byte characters shift every record after them.
+                logger.error("Non-ASCII data in %s", self.filename)
+                raise ValueError("Non-ASCII data; records must be ASCII.")
+            logger.error("Invalid file length: %d", len(buf))
+            raise ValueError("Invalid line length.")
+        return buf
+
+    def _unpack_columns(self, buf, record_type):
+        """Unpack the records of one type from a buffer of whole records.
+
+        Args:
+            buf (bytes): The file content, as returned by `_read_buffer`.
+            record_type (str): The record type to unpack.
+
+        Returns:
+            dict: The values of each field of the record type, as an int64
+                array for numeric fields and a list of strings otherwise.
+
+        Raises:
+            ValueError: If a transaction has an invalid currency code.
+        """
+        layout = self.parser.RECORD_STRUCTS[record_type]
+        field_id = self.parser.FIELD_IDS[record_type]
+        rows = [row for row in layout.iter_unpack(buf) if row[0] == field_id]
+        names = self.parser.FIELD_DEFINITIONS[record_type]
+        raw = dict(zip(names, list(zip(*rows)) or [()] * len(names)))
+        if record_type == "TRANSACTION":
+            # Currencies are checked on the raw bytes, before any decoding.
+            invalid = set(raw["currency"]).difference(self.parser.CURRENCY_CODES)
+            if invalid:
+                code = min(invalid).decode("ascii", "replace")
+                logger.error("Invalid currency code: %s", code)
+                raise ValueError(f"Invalid currency code: {code}")
+        return {
+            name: self.parser.decode_column(name, column)
+            for name, column in raw.items()
+        }
 
     def validate_data(self, data, record_type):
         """Validate the data based on the record type.
@@ -93,30 +449,89 @@ class FixedWidthFile:
             amount (str): The transaction amount.
             currency (str): The currency code.
 
+        Returns:
+            bool: True if the transaction was added, False otherwise.
+
         Raises:
-            ValueError: If the currency is invalid.
-        """
-        lines = self.file_manager.read_lines()
-        new_transaction_data = {
-            "field_id": "02",
-            "counter": str(self.transaction_counter + 1).zfill(6),
-            "amount": str(int(decimal.Decimal(amount) * 100)).zfill(12),
-            "currency": currency,
-            "reserved": " " * 95,
-        }
+            ValueError: If the amount or currency is invalid.
+        """
+        return self.add_transactions([(amount, currency)])
+
+    def add_transactions(self, transactions):
+        """Add several transactions to the file with a single write.
+
+        Every transaction is converted and validated before anything is
+        written, then the new records and the updated footer replace the old
+        footer in one write.
+
+        Args:
+            transactions (iterable): The (amount, currency) pairs to add.
+
+        Returns:
+            bool: True if the transactions were added, False otherwise.
+
+        Raises:
+            ValueError: If an amount or currency is invalid, or a value does
+                not fit its field.
+        """
+        entries = [(_to_cents(amount), currency) for amount, currency in transactions]
         try:
-            footer_index, _ = self.find_footer(lines)
+            index, footer_data, terminator = self._load_footer()
         except ValueError:
             logger.error("Footer not found. Cannot add transaction.")
-            return
-
-        new_transaction_line = (
-            self.parser.format_line(new_transaction_data, "TRANSACTION") + "\\n"
+            return False
+        if not entries:
+            return True
+
+        lines = []
+        counter = self.transaction_counter
+        for counter, (cents, currency) in enumerate(entries, counter + 1):
+            data = {
+                "field_id": "02",
+                "counter": counter,
+                "amount": cents,
+                "currency": currency,
+            }
+            self.validate_data(data, "TRANSACTION")
+            lines.append(self._formatted_record(data, "TRANSACTION"))
+        total = sum(cents for cents, _ in entries)
+        footer_data = dict(
+            footer_data,
+            total_count=footer_data["total_count"] + len(entries),
+            control_sum=footer_data["control_sum"] + total,
         )
-        lines.insert(footer_index, new_transaction_line)
-        self.update_footer(lines, self.transaction_counter + 1, decimal.Decimal(amount))
-        self.file_manager.write_lines(lines)
-        self.transaction_counter += 1
+        lines.append(self._formatted_record(footer_data, "FOOTER"))
+        # The footer is the last record, so only it is rewritten: the new
+        # transactions take its place and the updated footer follows.
+        self.file_manager.write_tail(
+            index * (self.parser.RECORD_LENGTH + 1),
+            "\n".join(lines).encode("ascii") + terminator,
+        )
+        if self._lines is not None:
+            self._lines[index:] = lines
+        self._footer = (index + len(entries), footer_data, terminator)
+        self._max_counter = counter
+        self.records = None
+        return True
+
+    def _formatted_record(self, data, record_type):
+        """Format a record and check that it fills exactly one record slot.
+
+        Args:
+            data (dict): The data to format.
+            record_type (str): The record type.
+
+        Returns:
+            str: The formatted record.
+
+        Raises:
+            ValueError: If a value is too long for its field.
+        """
+        line = self.parser.format_line(data, record_type) + "\\n"
+        if len(line) != self.parser.RECORD_LENGTH:
+            logger.error("Value too long for a %s record: %s", record_type, data)
+            raise ValueError(f"Value too long for a {record_type} record.")
+        return line
 
     def set_value(self, record_type, field_name, new_value, transaction_counter=None):
         """
@@ -129,53 +544,210 @@ class FixedWidthFile:
 
         Returns:
             bool: True if the field was successfully updated, False otherwise.
+
+        Raises:
+            ValueError: If a numeric value is not an unsigned number, a text
+                value is not printable ASCII, a value does not fit its field,
+                or an amount change would make the control sum negative.
         """
 
-        lines = self.file_manager.read_lines()
-        updated = False
-        for i, line in enumerate(lines):
-            data = self.parser.parse_line(line, record_type)
-            if self.matches_transaction_counter(data, transaction_counter):
-                if field_name == "amount":
-                    old_value = data[field_name]
-                    new_value = str(new_value).zfill(12)
-                data[field_name] = new_value
-                lines[i] = self.parser.format_line(data, record_type) + "\\n"
-                updated = True
-                break
-
-        if updated:
-            self.file_manager.write_lines(lines)
-            difference = decimal.Decimal(new_value) - decimal.Decimal(old_value)
-            self.update_footer(
-                lines, self.transaction_counter, decimal.Decimal(difference)
+        if field_name not in self.parser.FIELD_DEFINITIONS.get(record_type, {}):
+            logger.error("Unknown field for %s: %s", record_type, field_name)
+            return False
+        record_length = self.parser.RECORD_LENGTH
+        index = self._locate_record(record_type, transaction_counter)
+        if index is None:
+            return False
+
+        if self._lines is not None:
+            line = self._lines[index]
+        else:
+            line = self.file_manager.read_record(index, record_length)
+        data = self.parser.parse_line(line, record_type)
+        old_value = data.get(field_name)
+        data[field_name] = _to_field_value(field_name, new_value)
+        changed = {index: self._formatted_record(data, record_type)}
+        if field_name == "amount":
+            changed.update(self._adjusted_footer(data[field_name] - old_value))
+        # Records are fixed-width, so each changed record is overwritten in
+        # its own slot and the rest of the file is left untouched.
+        self.file_manager.write_records(changed, record_length)
+        for changed_index, changed_line in changed.items():
+            self._update_columns(changed_index, changed_line)
+            if self._lines is not None:
+                self._lines[changed_index] = changed_line
+        if record_type == "FOOTER":
+            self._footer = None
+        if field_name == "counter":
+            self._max_counter = None
+        return True
+
+    def _adjusted_footer(self, amount):
+        """Apply an amount change to the control sum of the footer record.
+
+        Args:
+            amount (int): The change to the control sum, in cents.
+
+        Returns:
+            dict: The updated footer record, keyed by its index in the file.
+
+        Raises:
+            ValueError: If the change would make the control sum negative or
+                too long for its field.
+        """
+        index, footer_data, terminator = self._load_footer()
+        if footer_data["control_sum"] + amount < 0:
+            logger.error("Control sum cannot be negative.")
+            raise ValueError("Control sum cannot be negative.")
+        footer_data = dict(footer_data, control_sum=footer_data["control_sum"] + amount)
+        line = self._formatted_record(footer_data, "FOOTER")
+        self._footer = (index, footer_data, terminator)
+        return {index: line}
+
+    def verify_control_sum(self):
+        """Check the control sum of the footer against the transaction amounts.
+
+        The amounts are summed from scratch over a bulk read of the amount
+        column.
+
+        Returns:
+            bool: True if the footer matches the sum of the amounts.
+
+        Raises:
+            ValueError: If the file is invalid or has no footer.
+        """
+        control_sum = sum(self.read_columns()["amount"])
+        _, footer_data, _ = self._load_footer()
+        if footer_data["control_sum"] != control_sum:
+            logger.error(
+                "Control sum mismatch: footer has %d, transactions sum to %d.",
+                footer_data["control_sum"],
+                control_sum,
+            )
+            return False
+        return True
+
+    def _load_footer(self):
+        """Read the footer record once and keep it for later updates.
+
+        Returns:
+            tuple: The index of the footer record, its data and the newline
+                following it (empty if the file has none).
+
+        Raises:
+            ValueError: If the last record is not a footer.
+        """
+        if self._footer is None:
+            record_length = self.parser.RECORD_LENGTH
+            offset, footer_line, terminator = self.file_manager.read_last_record(
+                record_length
             )
-            self.file_manager.write_lines(lines)
-        return updated
+            _, footer_data = self.find_footer([footer_line])
+            self._footer = (offset // (record_length + 1), footer_data, terminator)
+        return self._footer
+
+    def _locate_record(self, record_type, transaction_counter=None):
+        """Find the index of a record in the file.
+
+        Uses the loaded columns and counter index when available, and falls
+        back to scanning the records otherwise. The records read for the scan
+        are kept, and kept in sync by the writes, so later lookups on the
+        same instance do not read the file again.
 
-    def update_footer(self, lines, transaction_counter, amount):
-        """Update the footer line with the new transaction count and control sum.
+        Args:
+            record_type (str): The record type to find.
+            transaction_counter (str, optional): The counter of the transaction.
+
+        Returns:
+            int or None: The index of the record, or None if not found.
+        """
+        if self.records is None:
+            if self._lines is None:
+                self._lines = self.file_manager.read_records(self.parser.RECORD_LENGTH)
+            return self.find_record(self._lines, record_type, transaction_counter)
+        positions = self.records.positions[record_type]
+        if transaction_counter is None:
+            return positions[0] if positions else None
+        if record_type != "TRANSACTION":
+            return None
+        column_index = self.records.counter_index.get(_to_counter(transaction_counter))
+        return None if column_index is None else positions[column_index]
+
+    def _update_columns(self, index, line):
+        """Write a rewritten record back into the loaded columns, if any.
+
+        Args:
+            index (int): The index of the record in the file.
+            line (str): The new content of the record.
+        """
+        if self.records is None:
+            return
+        record_type = self.parser.get_record_type(line)
+        columns = self.records.columns[record_type]
+        column_index = bisect.bisect_left(self.records.positions[record_type], index)
+        data = self.parser.parse_line(line, record_type)
+        if record_type == "TRANSACTION":
+            self._reindex_counter(column_index, data["counter"])
+        for field_name, value in data.items():
+            if field_name in columns:
+                columns[field_name][column_index] = value
+
+    def _reindex_counter(self, column_index, counter):
+        """Point the counter index at a transaction whose counter may change.
+
+        Only the old and new counters of the transaction are touched, so the
+        first transaction with a given counter keeps winning. If the
+        transaction was indexed under its old counter, the next transaction
+        sharing that counter takes its place.
+
+        Args:
+            column_index (int): The position of the transaction in the columns.
+            counter (int): The new counter of the transaction.
+        """
+        counters = self.records.columns["TRANSACTION"]["counter"]
+        counter_index = self.records.counter_index
+        old_counter = counters[column_index]
+        if old_counter == counter:
+            return
+        if counter_index.get(old_counter) == column_index:
+            try:
+                counter_index[old_counter] = counters.index(
+                    old_counter, column_index + 1
+                )
+            except ValueError:
+                del counter_index[old_counter]
+        if counter_index.get(counter, column_index) >= column_index:
+            counter_index[counter] = column_index
+
+    def find_record(self, lines, record_type, transaction_counter=None):
+        """Find the first record of a type, optionally by transaction counter.
+
+        Only the record ID and counter slices are compared, so lines that do
+        not match are never parsed.
 
         Args:
             lines (list): The list of lines in the file.
-            transaction_counter (int): The new transaction count.
-            amount (decimal.Decimal): The amount of the new transaction.
+            record_type (str): The record type to find.
+            transaction_counter (str, optional): The counter of the transaction.
 
-        Raises:
-            ValueError: If the footer is not found in the file.
+        Returns:
+            int or None: The index of the matching line, or None if not found.
         """
-        try:
-            footer_index, footer_data = self.find_footer(lines)
-            footer_data["total_count"] = str(transaction_counter).zfill(6)
-            current_control_sum = int(footer_data["control_sum"])
-            additional_amount = int(amount * 100)
-            footer_data["control_sum"] = str(
-                current_control_sum + additional_amount
-            ).zfill(12)
-            lines[footer_index] = self.parser.format_line(footer_data, "FOOTER") + "\\n"
-        except ValueError as e:
-            logger.error("Error updating footer: %s", str(e))
-            raise
+        field_id = self.parser.FIELD_IDS[record_type].decode("ascii")
+        start, end = self.parser.FIELD_DEFINITIONS["TRANSACTION"]["counter"]
+        counter = None
+        if transaction_counter is not None:
+            # Normalised once, so each record is compared on its raw slice.
+            number = _to_counter(transaction_counter)
+            if record_type != "TRANSACTION" or number is None:
+                return None
+            counter = f"{number:0{end - start}d}"
+        for i, line in enumerate(lines):
+            if line[:2] != field_id:
+                continue
+            if counter is None or line[start:end] == counter:
+                return i
+        return None
 
     def find_footer(self, lines):
         """Find and return the footer line from the file lines.
@@ -187,34 +759,26 @@ class FixedWidthFile:
             tuple: The index of the footer line and the footer data.
         """
         for i in reversed(range(len(lines))):
-            if "03" == lines[i][:2].strip():
+            if lines[i].startswith("03"):
                 return i, self.parser.parse_line(lines[i], "FOOTER")
         logger.error("No footer found in the file.")
         raise ValueError("Footer not found in the file.")
 
     def initialize_transaction_counter(self):
-        """Initialize the transaction counter by reading the existing records.
-
-        Returns:
-            int: The number of existing transactions.
-        """
-        lines = self.file_manager.read_lines()
-        counter = 0
-        for line in lines:
-            if line.startswith("02"):
-                counter += 1
-        return counter
+        """Initialize the transaction counter from the last transaction.
 
-    def matches_transaction_counter(self, data, transaction_counter):
-        """Check if the transaction counter in the data matches the provided transaction counter.
-
-        Args:
-            data (dict): The data dictionary.
-            transaction_counter (str): The transaction counter to match.
+        Transactions are appended with increasing counters right before the
+        footer, so only the record preceding the last one is read.
 
         Returns:
-            bool: True if the transaction counter matches, False otherwise.
+            int: The counter of the last transaction, or 0 if there is none.
         """
-        return transaction_counter is None or data.get("counter", "").zfill(
-            6
-        ) == transaction_counter.zfill(6)
+        record_length = self.parser.RECORD_LENGTH
+        offset, _, _ = self.file_manager.read_last_record(record_length)
+        index = offset // (record_length + 1) - 1
+        if index < 0:
+            return 0
+        line = self.file_manager.read_record(index, record_length)
+        if not line.startswith("02"):
+            return 0
+        return self.parser.parse_line(line, "TRANSACTION")["counter"]
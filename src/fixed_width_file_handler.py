@@ -1,5 +1,23 @@
 """Module for IO operations on fixed-width files. """
 
+import contextlib
+import mmap
+import os
+
+
+def _decode(data):
+    """Decode record bytes, which are ASCII so fields sit at fixed byte offsets.
+
+    Raises:
+        ValueError: If the data holds non-ASCII bytes.
+    """
+    try:
+        return str(data, "ascii")
+    except UnicodeDecodeError as e:
+        raise ValueError(
+            f"Non-ASCII byte at offset {e.start}; records must be ASCII."
+        ) from e
+
 
 class FixedWidthFileManager:
     """
@@ -12,12 +30,126 @@ class FixedWidthFileManager:
     def __init__(self, filename):
         self.filename = filename
 
-    def read_lines(self):
-        """Read lines from the file and return them as a list."""
-        with open(self.filename, "r", encoding="utf-8", newline="") as file:
-            return file.read().splitlines()
+    def read_bytes(self):
+        """Read the whole file as bytes in a single call.
+
+        The kernel is told the file is read sequentially, where supported, so
+        it reads ahead aggressively while the call is in flight.
+        """
+        with open(self.filename, "rb") as file:
+            if hasattr(os, "posix_fadvise"):
+                os.posix_fadvise(file.fileno(), 0, 0, os.POSIX_FADV_SEQUENTIAL)
+            return file.read()
+
+    @contextlib.contextmanager
+    def mapped(self):
+        """Map the file read-only for zero-copy scans.
+
+        The mapping is advised as sequential, where supported, so page faults
+        are served from read-ahead while the scan is running.
+
+        Yields:
+            mmap.mmap or bytes: The mapped file, or empty bytes for an empty file.
+        """
+        with open(self.filename, "rb") as file:
+            if os.fstat(file.fileno()).st_size == 0:
+                yield b""
+                return
+            with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                if hasattr(mmap, "MADV_SEQUENTIAL"):
+                    mm.madvise(mmap.MADV_SEQUENTIAL)
+                yield mm
+
+    def read_records(self, record_length):
+        """Read the file and slice it into fixed-length records.
+
+        Every record is followed by a single newline, so record `i` starts at
+        byte `i * (record_length + 1)` and no scan for line breaks is needed.
+        The mapped file is decoded once and the records are sliced from the
+        resulting string, so no bytes object is created per record.
+
+        Args:
+            record_length (int): The length of a record without its newline.
+
+        Returns:
+            list: The records as strings.
+
+        Raises:
+            ValueError: If the file is not ASCII or a record is not followed
+                by a newline.
+        """
+        with self.mapped() as mm:
+            text = _decode(mm)
+        stride = record_length + 1
+        if not set(text[record_length::stride]) <= {"\n"}:
+            raise ValueError("Invalid line length.")
+        return [
+            text[offset : offset + record_length]
+            for offset in range(0, len(text), stride)
+        ]
+
+    def read_last_record(self, record_length):
+        """Read only the last record of the file.
+
+        Args:
+            record_length (int): The length of a record without its newline.
+
+        Returns:
+            tuple: The byte offset of the last record, the record as a string
+                and the newline following it (empty if the file has none).
+
+        Raises:
+            ValueError: If the record is not ASCII.
+        """
+        with open(self.filename, "rb") as file:
+            size = file.seek(0, os.SEEK_END)
+            file.seek(max(size - record_length - 1, 0))
+            tail = file.read()
+        terminator = b"\n" if tail.endswith(b"\n") else b""
+        record = tail[: len(tail) - len(terminator)][-record_length:]
+        return size - len(terminator) - len(record), _decode(record), terminator
+
+    def read_record(self, index, record_length):
+        """Read a single record in place, without reading the rest of the file.
+
+        Args:
+            index (int): The index of the record.
+            record_length (int): The length of a record without its newline.
+
+        Returns:
+            str: The record.
+
+        Raises:
+            ValueError: If the record is not ASCII.
+        """
+        fd = os.open(self.filename, os.O_RDONLY)
+        try:
+            return _decode(os.pread(fd, record_length, index * (record_length + 1)))
+        finally:
+            os.close(fd)
+
+    def write_records(self, records, record_length):
+        """Overwrite records in place, one positioned write per record.
+
+        Args:
+            records (dict): The new records as strings, keyed by record index.
+            record_length (int): The length of a record without its newline.
+        """
+        fd = os.open(self.filename, os.O_WRONLY)
+        try:
+            for index, record in records.items():
+                os.pwrite(fd, record.encode("ascii"), index * (record_length + 1))
+        finally:
+            os.close(fd)
+
+    def write_tail(self, offset, data):
+        """Overwrite the file from `offset` onwards with `data` in one write.
 
-    def write_lines(self, lines):
-        """Write lines to the file."""
-        with open(self.filename, "w", encoding="utf-8", newline="") as file:
-            file.write("\n".join(lines))
+        Args:
+            offset (int): The byte offset to start writing at.
+            data (bytes): The new content of the end of the file.
+        """
+        with open(self.filename, "r+b") as file:
+            file.seek(offset)
+            file.write(data)
+            file.truncate()
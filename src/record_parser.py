@@ -1,11 +1,197 @@
 """ This module contains the RecordParser class. """
 
+import array
 import logging
+import re
+import struct
 
-logger = logging.getLogger("FixedWidthFile")
-logging.basicConfig(
-    level=logging.DEBUG, format="%(asctime)s - %(levelname)s - %(message)s"
-)
+logger = logging.getLogger(__name__)
+
+# Fields held as int in parsed records and zero-padded when formatted.
+_NUMERIC_FIELDS = frozenset({"counter", "amount", "total_count", "control_sum"})
+# Fields that always fill their width, so they never carry padding.
+_FULL_WIDTH_FIELDS = frozenset({"field_id", "currency"})
+
+
+def _blanks(field_definitions, fill):
+    """Map every field width in the layouts to a string of `fill` that wide."""
+    widths = {
+        end - start
+        for fields in field_definitions.values()
+        for start, end in fields.values()
+    }
+    return {width: fill * width for width in widths}
+
+
+def _invalid_number(value):
+    """Log and raise the error for a numeric field holding non-digits."""
+    logger.error("Invalid numeric field: %r", value)
+    raise ValueError(f"Invalid numeric field: {value!r}")
+
+
+def _invalid_text(value):
+    """Log and raise the error for a text field holding non-ASCII bytes."""
+    logger.error("Non-ASCII text field: %r", value)
+    raise ValueError(f"Non-ASCII text field: {value!r}; records must be ASCII.")
+
+
+def _numeric_spans(plan):
+    """Return the (start, end) ranges covered by adjacent numeric fields."""
+    spans = []
+    for name, start, end in plan:
+        if name not in _NUMERIC_FIELDS:
+            continue
+        if spans and spans[-1][1] == start:
+            spans[-1] = (spans[-1][0], end)
+        else:
+            spans.append((start, end))
+    return spans
+
+
+def _compile(name, source):
+    """Compile generated source and return the function it defines."""
+    namespace = {"_invalid_number": _invalid_number}
+    exec(source, namespace)  # pylint: disable=exec-used
+    return namespace[name]
+
+
+def _field_source(name, start, end):
+    """Return the source of the expression parsing one field of `line`."""
+    if name in _NUMERIC_FIELDS:
+        return f"int(line[{start}:{end}])"
+    if name in _FULL_WIDTH_FIELDS:
+        return f"line[{start}:{end}]"
+    return f"line[{start}:{end}].strip()"
+
+
+def _compile_parser(record_type, plan):
+    """Generate a straight-line parser for one record layout.
+
+    The layout is known at import time, so the parser is emitted as a single
+    dict literal of slices instead of a loop over the field definitions.
+    Numeric fields go straight through int(), which accepts the zero
+    padding, full-width fields are taken as-is and text fields are stripped.
+    Since int() also accepts signs, blanks and underscores, the adjacent
+    numeric fields are first checked as one span with a single isdigit()
+    call.
+
+    Args:
+        record_type (str): The record type the parser produces.
+        plan (tuple): The (field_name, start, end) tuples of the layout.
+
+    Returns:
+        function: A function mapping a line to its parsed data dict.
+    """
+    fields = "".join(
+        f"{name!r}: {_field_source(name, start, end)}, " for name, start, end in plan
+    )
+    checks = "".join(
+        f"    if not line[{start}:{end}].isdigit():\n"
+        f"        _invalid_number(line[{start}:{end}])\n"
+        for start, end in _numeric_spans(plan)
+    )
+    source = (
+        f"def parse_{record_type}(line):\n"
+        f"{checks}"
+        f"    return {{'type': {record_type!r}, {fields}}}\n"
+    )
+    return _compile(f"parse_{record_type}", source)
+
+
+def _compile_formatter(record_type, plan, blanks):
+    """Generate a straight-line formatter for one record layout.
+
+    Numeric fields are zero-filled and text fields space-padded to widths
+    resolved at import time, and the parts are joined once. Missing fields
+    default to the precomputed blank of their width, which is emitted as a
+    constant, so no blank is built per call; the padding call still runs on
+    it and returns it unchanged.
+
+    Args:
+        record_type (str): The record type the formatter writes.
+        plan (tuple): The (field_name, start, end) tuples of the layout.
+        blanks (tuple): The zero and space blanks keyed by field width.
+
+    Returns:
+        function: A function mapping a data dict to its formatted line.
+    """
+    zeros, pads = blanks
+    parts = "".join(
+        (
+            f"str(get({name!r}, {zeros[end - start]!r})).zfill({end - start}), "
+            if name in _NUMERIC_FIELDS
+            else f"get({name!r}, {pads[end - start]!r}).ljust({end - start}), "
+        )
+        for name, start, end in plan
+    )
+    source = (
+        f"def format_{record_type}(data):\n"
+        "    get = data.get\n"
+        f"    return ''.join(({parts}))\n"
+    )
+    return _compile(f"format_{record_type}", source)
+
+
+def _formatters(plans, blanks):
+    """Compile the formatter of every record layout, keyed by record type."""
+    return {
+        record_type: _compile_formatter(record_type, plan, blanks)
+        for record_type, plan in plans.items()
+    }
+
+
+def _compile_struct(plan, record_length):
+    """Build a struct layout unpacking one newline-terminated record.
+
+    Args:
+        plan (tuple): The (field_name, start, end) tuples of the layout.
+        record_length (int): The length of a record without its newline.
+
+    Returns:
+        struct.Struct: A layout with one bytes item per field.
+    """
+    layout, position = "", 0
+    for _, start, end in plan:
+        layout += f"{start - position}x{end - start}s"
+        position = end
+    return struct.Struct(f"{layout}{record_length - position + 1}x")
+
+
+def _structs(plans, record_length):
+    """Build the struct layout of every record layout, keyed by record type."""
+    return {
+        record_type: _compile_struct(plan, record_length)
+        for record_type, plan in plans.items()
+    }
+
+
+def _record_pattern(plans, field_ids, currencies, record_length):
+    """Build the regex source matching one record of any type, as bytes.
+
+    Args:
+        plans (dict): The (field_name, start, end) tuples per record type.
+        field_ids (dict): The bytes field ID per record type.
+        currencies (frozenset): The allowed currency codes as bytes.
+        record_length (int): The length of a record without its newline.
+
+    Returns:
+        bytes: An alternation with one branch per record type.
+    """
+    currency = b"(?:" + b"|".join(map(re.escape, sorted(currencies))) + b")"
+    branches = []
+    for record_type, plan in plans.items():
+        branch = b""
+        for name, start, end in plan:
+            if name == "field_id":
+                branch += re.escape(field_ids[record_type])
+            elif name == "currency":
+                branch += currency
+            elif name in _NUMERIC_FIELDS:
+                branch += b"[0-9]{%d}" % (end - start)
+            else:
+                branch += b"[\x20-\x7e]{%d}" % (end - start)
+        branches.append(branch + b"[\x20-\x7e]{%d}" % (record_length - plan[-1][2]))
+    return b"(?:" + b"|".join(branches) + b")"
 
 
 class RecordParser:
@@ -35,27 +221,109 @@ class RecordParser:
             "reserved": (20, 118),
         },
     }
+    # (field_name, start, end) per record type, flattened once at import.
+    _PLAN = {
+        record_type: tuple((name, start, end) for name, (start, end) in fields.items())
+        for record_type, fields in FIELD_DEFINITIONS.items()
+    }
+    _PARSERS = {
+        record_type: _compile_parser(record_type, plan)
+        for record_type, plan in _PLAN.items()
+    }
+    # Blank defaults for every field width, shared by the formatters.
+    _PAD_CACHE = _blanks(FIELD_DEFINITIONS, " ")
+    _ZERO_CACHE = _blanks(FIELD_DEFINITIONS, "0")
+    _FORMATTERS = _formatters(_PLAN, (_ZERO_CACHE, _PAD_CACHE))
+    NUMERIC_FIELDS = _NUMERIC_FIELDS
     RECORD_LENGTH = 120
-    ALLOWED_CURRENCIES = ["USD", "EUR", "GBP"]
+    RECORD_ID_STRUCT = struct.Struct(f"2s{RECORD_LENGTH - 1}x")
+    RECORD_STRUCTS = _structs(_PLAN, RECORD_LENGTH)
+    RECORD_TYPES = {"01": "HEADER", "02": "TRANSACTION", "03": "FOOTER"}
+    FIELD_IDS = {
+        record_type: field_id.encode("ascii")
+        for field_id, record_type in RECORD_TYPES.items()
+    }
+    RECORD_IDS = {field_id: record_type for record_type, field_id in FIELD_IDS.items()}
+    # Record types keyed by both the str and the bytes field ID.
+    _TYPES = {**RECORD_TYPES, **RECORD_IDS}
+    ALLOWED_CURRENCIES = frozenset({"USD", "EUR", "GBP"})
+    CURRENCY_CODES = frozenset(code.encode("ascii") for code in ALLOWED_CURRENCIES)
+    # Whole-record layouts, for validating a file in a single regex pass.
+    RECORD_PATTERN = re.compile(
+        _record_pattern(_PLAN, FIELD_IDS, CURRENCY_CODES, RECORD_LENGTH)
+    )
+    FILE_PATTERN = re.compile(b"(?:%s(?:\n|\\Z))*" % RECORD_PATTERN.pattern)
 
     def get_record_type(self, line):
         """Get the record type based on the field ID.
 
-        The field ID is the first two characters of the line.
+        The field ID is the first two characters of the line, and is looked up
+        with a single dict access whether the line is text or bytes.
 
         Args:
-            line (str): The line to parse.
+            line (str or bytes): The line to parse.
 
         Returns:
             str: The record type.
         """
         field_id = line[:2]
-        record_types = {"01": "HEADER", "02": "TRANSACTION", "03": "FOOTER"}
-        if field_id in record_types:
-            return record_types[field_id]
+        record_type = self._TYPES.get(field_id)
+        if record_type is not None:
+            return record_type
         logger.error("Invalid record type ID: %s", field_id)
         raise ValueError(f"Invalid record type ID: {field_id}")
 
+    def decode_field(self, field_name, value):
+        """Decode one raw field value read from the file as bytes.
+
+        Args:
+            field_name (str): The name of the field.
+            value (bytes): The raw field value.
+
+        Returns:
+            int or str: The value, parsed the same way as by `parse_line`.
+
+        Raises:
+            ValueError: If a numeric field holds anything but digits, or a
+                text field holds non-ASCII bytes.
+        """
+        if field_name in _NUMERIC_FIELDS:
+            if not value.isdigit():
+                _invalid_number(value)
+            return int(value)
+        if not value.isascii():
+            _invalid_text(value)
+        if field_name in _FULL_WIDTH_FIELDS:
+            return value.decode("ascii")
+        return value.decode("ascii").strip()
+
+    def decode_column(self, field_name, values):
+        """Decode the raw values of one field read from the file as bytes.
+
+        Args:
+            field_name (str): The name of the field.
+            values (sequence): The raw field values.
+
+        Returns:
+            array.array or list: An int64 array for numeric fields, a list of
+                strings otherwise.
+
+        Raises:
+            ValueError: If a numeric field holds anything but digits, or a
+                text field holds non-ASCII bytes.
+        """
+        # One check over the joined column validates every value.
+        joined = b"".join(values)
+        if field_name in _NUMERIC_FIELDS:
+            if joined and not joined.isdigit():
+                _invalid_number(next(v for v in values if not v.isdigit()))
+            return array.array("q", map(int, values))
+        if not joined.isascii():
+            _invalid_text(next(v for v in values if not v.isascii()))
+        if field_name in _FULL_WIDTH_FIELDS:
+            return [value.decode("ascii") for value in values]
+        return [value.decode("ascii").strip() for value in values]
+
     def parse_line(self, line, record_type):
         """
         Parse a line into a dictionary based on the record type.
@@ -64,10 +332,7 @@ class RecordParser:
             line (str): The line to parse.
             record_type (str): The record type.
         """
-        data = {"type": record_type}
-        for field_name, (start, end) in self.FIELD_DEFINITIONS[record_type].items():
-            data[field_name] = line[start:end].strip()
-        return data
+        return self._PARSERS[record_type](line)
 
     def format_line(self, data, record_type):
         """Format a line based on the record type.
@@ -79,13 +344,4 @@ class RecordParser:
         Returns:
             str: The formatted line.
         """
-        formatted_line = ""
-        for field_name, (start, end) in self.FIELD_DEFINITIONS[record_type].items():
-            value = data.get(field_name, "")
-            field_length = end - start
-            if field_name == "amount":
-                formatted_value = value.zfill(field_length)
-            else:
-                formatted_value = value.ljust(field_length)
-            formatted_line += formatted_value
-        return formatted_line
+        return self._FORMATTERS[record_type](data)
@@ -0,0 +1,34 @@
+"""Shared fixtures for the tests."""
+
+import itertools
+
+import pytest
+
+
+@pytest.fixture
+def write_file(tmp_path):
+    """Return a function writing a file with a header, transactions and a footer.
+
+    The function takes the (counter, cents, currency) of each transaction and
+    an optional footer control sum, which defaults to the sum of the amounts,
+    and returns the filename. Records are laid out by hand, independently of
+    the parser under test.
+    """
+    names = (tmp_path / f"file{index}.fwf" for index in itertools.count())
+
+    def write(transactions, control_sum=None):
+        if control_sum is None:
+            control_sum = sum(cents for _, cents, _ in transactions)
+        records = [f"01{'John':28}{'Doe':30}"]
+        records += [
+            f"02{counter:06d}{cents:012d}{currency}"
+            for counter, cents, currency in transactions
+        ]
+        records.append(f"03{len(transactions):06d}{control_sum:012d}")
+        path = next(names)
+        path.write_text(
+            "".join(f"{record:118}\\n\n" for record in records), encoding="ascii"
+        )
+        return str(path)
+
+    return write
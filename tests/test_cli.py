@@ -0,0 +1,39 @@
+"""Tests for the command-line interface."""
+
+import pytest
+
+from src import cli
+
+
+@pytest.fixture(name="filename")
+def fixture_filename(write_file):
+    """A file with two transactions, with the transaction cache cleared."""
+    cli._TCACHE.clear()  # pylint: disable=protected-access
+    return write_file([(1, 10000, "USD"), (2, 250, "EUR")])
+
+
+def test_get_value_zero_fills_numeric_fields(filename):
+    """Numeric fields are printed as they are stored in the file."""
+    assert cli.get_value(filename, "TRANSACTION", "amount", "000001") == "000000010000"
+    assert cli.get_value(filename, "TRANSACTION", "counter", "2") == "000002"
+    assert cli.get_value(filename, "FOOTER", "total_count") == "000002"
+    assert cli.get_value(filename, "HEADER", "name") == "John"
+    assert cli.get_value(filename, "TRANSACTION", "currency", "2") == "EUR"
+
+
+def test_cached_file_is_reused_and_kept_in_sync(filename):
+    """Repeated calls share one parse and see their own writes."""
+    assert cli.get_value(filename, "TRANSACTION", "amount", "2") == "000000000250"
+    assert cli.set_value(filename, "TRANSACTION", "amount", "3.5", "2")
+    assert cli.get_value(filename, "TRANSACTION", "amount", "2") == "000000000350"
+    assert cli.get_value(filename, "FOOTER", "control_sum") == "000000010350"
+    assert cli.add_transaction(filename, "1.00", "GBP")
+    assert cli.get_value(filename, "TRANSACTION", "amount", "3") == "000000000100"
+
+
+def test_invalid_input_fails_without_raising(filename):
+    """Invalid values and unknown counters report failure."""
+    assert not cli.set_value(filename, "HEADER", "name", "Jörg")
+    assert not cli.set_value(filename, "TRANSACTION", "amount", "1", "9")
+    assert not cli.add_transaction(filename, "1.00", "XYZ")
+    assert cli.get_value(filename, "TRANSACTION", "amount", "9") is None
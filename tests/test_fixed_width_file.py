@@ -0,0 +1,187 @@
+"""Tests for the FixedWidthFile class."""
+
+import pytest
+
+from src import fixed_width_file as fixed_width_file_module
+from src.fixed_width_file import FixedWidthFile, RecordColumns
+
+
+@pytest.fixture(name="filename")
+def fixture_filename(write_file):
+    """A file with three transactions, the last two sharing counter 2."""
+    return write_file([(1, 100, "USD"), (2, 200, "EUR"), (2, 300, "GBP")])
+
+
+def test_read_returns_record_columns(filename):
+    """read() returns the records column-wise, in file order."""
+    records = FixedWidthFile(filename).read()
+    assert isinstance(records, RecordColumns)
+    assert len(records) == 5
+    assert [record["type"] for record in records] == [
+        "HEADER",
+        "TRANSACTION",
+        "TRANSACTION",
+        "TRANSACTION",
+        "FOOTER",
+    ]
+    assert records[1]["amount"] == 100
+    assert records[-1]["control_sum"] == 600
+    assert list(records.columns["TRANSACTION"]["counter"]) == [1, 2, 2]
+
+
+def test_record_columns_compare_equal_to_lists(filename):
+    """RecordColumns compares equal to a list of the same record dicts."""
+    records = FixedWidthFile(filename).read()
+    assert records == list(records)
+    assert records[1:3] == list(records)[1:3]
+    assert records != list(records)[:-1]
+
+
+def test_read_in_workers_matches_serial_read(write_file, monkeypatch):
+    """A read split across worker processes returns the same records."""
+    filename = write_file([(counter, counter * 10, "USD") for counter in range(1, 50)])
+    serial = list(FixedWidthFile(filename).read())
+    monkeypatch.setattr(fixed_width_file_module, "PARALLEL_READ_THRESHOLD", 1)
+    parallel = FixedWidthFile(filename).read(workers=3)
+    assert parallel == serial
+    assert parallel.positions == FixedWidthFile(filename).read().positions
+
+
+def test_validate_accepts_a_valid_file(filename):
+    """validate() passes a well-formed file."""
+    FixedWidthFile(filename).validate()
+
+
+@pytest.mark.parametrize(
+    "old, new, line",
+    [
+        (b"USD", b"XYZ", 2),
+        (b"John", b"J\xc3\xb6hn", 1),
+        (b"Doe ", b"D\xe9e ", 1),
+        (b"EUR", b"E\tR", 3),
+    ],
+)
+def test_validate_reports_the_invalid_line(filename, old, new, line):
+    """validate() rejects bad currencies and non-ASCII text by line number."""
+    with open(filename, "rb") as file:
+        content = file.read()
+    with open(filename, "wb") as file:
+        file.write(content.replace(old, new, 1))
+    with pytest.raises(ValueError, match=f"line {line}\\."):
+        FixedWidthFile(filename).validate()
+
+
+def test_non_ascii_files_are_rejected_by_every_reader(filename):
+    """read(), get_value() and set_value() agree with validate() on non-ASCII."""
+    with open(filename, "rb") as file:
+        content = file.read()
+    with open(filename, "wb") as file:
+        file.write(content.replace(b"Doe ", b"D\xe9e ", 1))
+    with pytest.raises(ValueError, match="ASCII"):
+        FixedWidthFile(filename).read()
+    with pytest.raises(ValueError, match="line 1"):
+        FixedWidthFile(filename).get_value("TRANSACTION", "amount", "1")
+    with pytest.raises(ValueError, match="ASCII"):
+        FixedWidthFile(filename).set_value("TRANSACTION", "amount", "1", "1")
+
+
+def test_add_transactions_appends_records_and_updates_footer(filename):
+    """add_transactions() appends with increasing counters and one footer."""
+    fixed_width_file = FixedWidthFile(filename)
+    assert fixed_width_file.add_transactions([("1.50", "USD"), ("2", "EUR")])
+    records = FixedWidthFile(filename).read()
+    transactions = records.columns["TRANSACTION"]
+    assert list(transactions["counter"]) == [1, 2, 2, 3, 4]
+    assert list(transactions["amount"]) == [100, 200, 300, 150, 200]
+    assert records[-1]["total_count"] == 5
+    assert records[-1]["control_sum"] == 950
+    assert fixed_width_file.add_transactions([])
+
+
+@pytest.mark.parametrize(
+    "transactions",
+    [[("1.00", "USD"), ("2.00", "XYZ")], [("-1.00", "USD")], [("1e3", "USD")]],
+)
+def test_add_transactions_writes_nothing_on_invalid_input(filename, transactions):
+    """add_transactions() validates every transaction before writing."""
+    with open(filename, "rb") as file:
+        content = file.read()
+    with pytest.raises(ValueError):
+        FixedWidthFile(filename).add_transactions(transactions)
+    with open(filename, "rb") as file:
+        assert file.read() == content
+
+
+def test_add_transaction_rejects_amounts_too_long_for_the_field(filename):
+    """An amount wider than its field raises instead of corrupting the file."""
+    with pytest.raises(ValueError, match="too long"):
+        FixedWidthFile(filename).add_transaction("99999999999.00", "USD")
+
+
+def test_verify_control_sum(write_file, filename):
+    """verify_control_sum() compares the footer with the summed amounts."""
+    assert FixedWidthFile(filename).verify_control_sum()
+    mismatched = write_file([(1, 100, "USD")], 99)
+    assert not FixedWidthFile(mismatched).verify_control_sum()
+
+
+def test_set_value_rewrites_only_the_changed_records(filename):
+    """set_value() overwrites the record and the footer slot in place."""
+    with open(filename, "rb") as file:
+        before = file.read().split(b"\n")
+    assert FixedWidthFile(filename).set_value("TRANSACTION", "amount", "5", "1")
+    with open(filename, "rb") as file:
+        after = file.read().split(b"\n")
+    changed = [index for index, line in enumerate(after) if line != before[index]]
+    assert changed == [1, 4]
+    records = FixedWidthFile(filename).read()
+    assert records[1]["amount"] == 500
+    assert records[-1]["control_sum"] == 1000
+
+
+def test_set_value_keeps_the_loaded_records_in_sync(filename):
+    """set_value() on a read file updates its records and counter index."""
+    fixed_width_file = FixedWidthFile(filename)
+    fixed_width_file.read()
+    assert fixed_width_file.set_value("TRANSACTION", "amount", "7", "1")
+    assert fixed_width_file.get_value("TRANSACTION", "amount", "1") == 700
+    assert fixed_width_file.get_value("FOOTER", "control_sum") == 1200
+    assert fixed_width_file.records == FixedWidthFile(filename).read()
+
+
+def test_counter_edit_keeps_duplicate_counters_indexed(filename):
+    """Renumbering the first of two equal counters indexes the second one."""
+    fixed_width_file = FixedWidthFile(filename)
+    fixed_width_file.read()
+    assert fixed_width_file.set_value("TRANSACTION", "counter", "5", "2")
+    assert fixed_width_file.records.counter_index == {1: 0, 2: 2, 5: 1}
+    assert fixed_width_file.get_value("TRANSACTION", "amount", "2") == 300
+    assert FixedWidthFile(filename).get_value("TRANSACTION", "amount", "2") == 300
+    assert fixed_width_file.get_value("TRANSACTION", "amount", "5") == 200
+
+
+@pytest.mark.parametrize("counter", ["2", "000002", "0000002", " 2", "+2"])
+@pytest.mark.parametrize("loaded", [False, True])
+def test_counter_formats_match_on_every_path(filename, counter, loaded):
+    """get_value() and set_value() accept the same counter spellings."""
+    fixed_width_file = FixedWidthFile(filename)
+    if loaded:
+        fixed_width_file.read()
+    assert fixed_width_file.get_value("TRANSACTION", "amount", counter) == 200
+    assert fixed_width_file.set_value("TRANSACTION", "amount", "9", counter)
+    assert FixedWidthFile(filename).read()[2]["amount"] == 900
+
+
+def test_set_value_rejects_invalid_values(filename):
+    """Unknown fields return False and invalid values raise ValueError."""
+    fixed_width_file = FixedWidthFile(filename)
+    assert not fixed_width_file.set_value("HEADER", "counter", "1")
+    with pytest.raises(ValueError, match="ASCII"):
+        fixed_width_file.set_value("HEADER", "name", "Jörg")
+    with pytest.raises(ValueError, match="too long"):
+        fixed_width_file.set_value("HEADER", "name", "x" * 40)
+    with pytest.raises(ValueError, match="Invalid number"):
+        fixed_width_file.set_value("TRANSACTION", "counter", "-1", "1")
+    assert fixed_width_file.set_value("FOOTER", "control_sum", "0")
+    with pytest.raises(ValueError, match="negative"):
+        fixed_width_file.set_value("TRANSACTION", "amount", "0", "1")